@@ -0,0 +1,79 @@
+"""
+In-memory TTL cache for Notion query results
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Awaitable, Callable, DefaultDict, Hashable, Optional, Tuple
+
+
+class QueryCache:
+    """LRU cache of query results, each entry expiring after its TTL"""
+    
+    def __init__(self, max_entries: int = 128):
+        """
+        Initialize query cache
+        
+        Args:
+            max_entries: Entries kept before the least recently used is evicted
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._locks: DefaultDict[Hashable, asyncio.Lock] = defaultdict(asyncio.Lock)
+    
+    async def get_or_fetch(
+        self,
+        key: Hashable,
+        ttl: int,
+        fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Return the cached value for a key, fetching it when missing or expired
+        
+        Concurrent misses for the same key wait for a single fetch.
+        
+        Args:
+            key: Cache key identifying the query
+            ttl: Seconds a fetched value stays valid; 0 bypasses the cache
+            fetch: Coroutine function producing the value
+        
+        Returns:
+            Cached or freshly fetched value
+        """
+        if ttl <= 0:
+            return await fetch()
+        
+        entry = self._lookup(key, ttl)
+        if entry is not None:
+            return entry[1]
+        
+        async with self._locks[key]:
+            # Another request may have fetched it while we waited
+            entry = self._lookup(key, ttl)
+            if entry is not None:
+                return entry[1]
+            
+            value = await fetch()
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            
+            return value
+    
+    def clear(self) -> None:
+        """Drop every cached entry"""
+        self._entries.clear()
+    
+    def _lookup(self, key: Hashable, ttl: int) -> Optional[Tuple[float, Any]]:
+        """Get a still-valid entry, marking it as recently used"""
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[0] >= ttl:
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+
+# Converted events of Notion queries, shared by all views
+query_cache = QueryCache()
@@ -2,14 +2,49 @@
 Configuration management for Notion ICS Calendar Feed Server
 """
 
+import copy
+import hashlib
+import json
 import os
+import pickle
 import yaml
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from dotenv import load_dotenv
 import logging
 
+from .models import ViewConfiguration
+
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _Loader
+
 logger = logging.getLogger(__name__)
 
+# Parsed YAML per config path, keyed by the file's modification time
+_parsed_configs: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
+# On-disk cache of validated view models (opt-in via NOTIONCAL_CONFIG_CACHE=1)
+_VIEW_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "notioncalfeed")
+# Bump when view models are built differently in ways their JSON schema
+# does not show (e.g. new validation or post-processing)
+_VIEW_CACHE_VERSION = 1
+
+# Plain scalars YAML resolves to something other than a string
+_YAML_BOOLS = {
+    value: flag
+    for flag, words in ((True, ("yes", "true", "on")), (False, ("no", "false", "off")))
+    for word in words
+    for value in (word, word.capitalize(), word.upper())
+}
+_YAML_NULLS = {"", "~", "null", "Null", "NULL"}
+
+# First characters that give a plain scalar YAML syntax we do not handle
+_YAML_INDICATORS = set("-?:,[]{}#&*!|>'\"%@`=.+<")
+
+# Returned by _fast_scalar for values the fast path cannot resolve exactly
+_UNSUPPORTED = object()
+
 def load_config(config_path: str = "config.yaml") -> Dict[str, Any]:
     """
     Load configuration from YAML file and environment variables
@@ -25,8 +60,7 @@ def load_config(config_path: str = "config.yaml") -> Dict[str, Any]:
     
     # Load YAML configuration
     try:
-        with open(config_path, 'r') as file:
-            config = yaml.safe_load(file)
+        config = _read_yaml(config_path)
     except FileNotFoundError:
         logger.error(f"Configuration file '{config_path}' not found")
         raise
@@ -43,6 +77,135 @@ def load_config(config_path: str = "config.yaml") -> Dict[str, Any]:
     return config
 
 
+def _read_yaml(config_path: str) -> Dict[str, Any]:
+    """Parse the YAML file, reusing the last parse while its mtime is unchanged"""
+    mtime = os.stat(config_path).st_mtime_ns
+    cached = _parsed_configs.get(config_path)
+    if cached is None or cached[0] != mtime:
+        with open(config_path, 'r') as file:
+            text = file.read()
+        data = _fast_parse(text)
+        if data is None:
+            data = yaml.load(text, Loader=_Loader)
+        cached = (mtime, data)
+        _parsed_configs[config_path] = cached
+    
+    # Callers mutate the result (env overrides), so never hand out the cached dict
+    return copy.deepcopy(cached[1])
+
+
+def _fast_parse(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse a config made only of nested block mappings without PyYAML
+    
+    Handles "key: value" lines with space indentation, comments, quoted
+    strings and plain strings, integers, booleans and nulls, which covers
+    typical config.yaml files. Anything else (flow collections, lists,
+    anchors, tags, block scalars, multi-line values, floats, dates...)
+    makes it give up so the caller falls back to the real YAML parser.
+    
+    Args:
+        text: YAML document text
+        
+    Returns:
+        Parsed configuration, or None when the document needs full YAML
+    """
+    root: Dict[str, Any] = {}
+    # (indent, mapping) for each open mapping, innermost last
+    stack = [(0, root)]
+    # Key whose value is either a nested mapping or null, decided by the next line
+    pending = None
+    
+    for line in text.splitlines():
+        content = line.lstrip(" ")
+        if not content or content.startswith("#"):
+            continue
+        if content[0] == "\t":
+            return None
+        indent = len(line) - len(content)
+        
+        key, sep, rest = content.partition(":")
+        if (
+            not sep
+            or not key.isascii()
+            or not key[0].isalpha()
+            or not key.replace("_", "").replace("-", "").isalnum()
+            or key in _YAML_BOOLS
+            or key in _YAML_NULLS
+            or (rest and not rest[0].isspace())
+        ):
+            return None
+        
+        if pending is not None:
+            parent, pending_key, pending_indent = pending
+            pending = None
+            if indent > pending_indent:
+                child: Dict[str, Any] = {}
+                parent[pending_key] = child
+                stack.append((indent, child))
+            else:
+                parent[pending_key] = None
+        
+        while stack[-1][0] > indent:
+            stack.pop()
+        if stack[-1][0] != indent:
+            return None
+        mapping = stack[-1][1]
+        if key in mapping:
+            return None
+        
+        rest = rest.strip()
+        if not rest or rest.startswith("#"):
+            # Resolved once the next line shows whether it opens a mapping
+            pending = (mapping, key, indent)
+            mapping[key] = None
+            continue
+        
+        value = _fast_scalar(rest)
+        if value is _UNSUPPORTED:
+            return None
+        mapping[key] = value
+    
+    return root or None
+
+
+def _fast_scalar(raw: str) -> Any:
+    """Resolve a non-empty single-line YAML value (comments included) for _fast_parse"""
+    if raw[:1] in ("'", '"'):
+        quote = raw[0]
+        end = raw.find(quote, 1)
+        trailing = raw[end + 1:]
+        # Escapes, doubled quotes and anything but a comment after the
+        # closing quote are left to PyYAML
+        if end < 0 or "\\" in raw[:end]:
+            return _UNSUPPORTED
+        if trailing and not (trailing[0] == " " and trailing.lstrip(" ").startswith("#")):
+            return _UNSUPPORTED
+        return raw[1:end]
+    
+    # A comment starts at a "#" preceded by a space
+    for i in range(1, len(raw)):
+        if raw[i] == "#" and raw[i - 1] == " ":
+            raw = raw[:i].rstrip()
+            break
+    
+    if raw in _YAML_NULLS:
+        return None
+    if raw in _YAML_BOOLS:
+        return _YAML_BOOLS[raw]
+    if raw.isdigit() and raw.isascii() and (raw == "0" or raw[0] != "0"):
+        return int(raw)
+    if (
+        raw[0] in _YAML_INDICATORS
+        or raw[0].isdigit()
+        or ": " in raw
+        or raw.endswith(":")
+        or "\t" in raw
+    ):
+        return _UNSUPPORTED
+    return raw
+
+
 def _apply_env_overrides(config: Dict[str, Any]) -> Dict[str, Any]:
     """Apply environment variable overrides to configuration"""
     
@@ -80,6 +243,10 @@ def _validate_config(config: Dict[str, Any]) -> None:
     if not config["calendar_views"]:
         raise ValueError("At least one calendar view must be configured")
     
+    # "all" is served as the combined feed of every view
+    if "all" in config["calendar_views"]:
+        raise ValueError("View name 'all' is reserved for the combined calendar feed")
+    
     # Validate each calendar view
     for view_name, view_config in config["calendar_views"].items():
         _validate_view_config(view_name, view_config)
@@ -103,6 +270,77 @@ def _validate_view_config(view_name: str, view_config: Dict[str, Any]) -> None:
     if days_forward is not None and (not isinstance(days_forward, int) or days_forward < 0):
         raise ValueError(f"View '{view_name}': 'query_days_forward' must be a non-negative integer or omitted")
 
+    for ttl_field in ("cache_ttl", "query_cache_ttl"):
+        ttl = view_config.get(ttl_field, None)
+        if ttl is not None and (not isinstance(ttl, int) or ttl < 0):
+            raise ValueError(f"View '{view_name}': '{ttl_field}' must be a non-negative integer or omitted")
+
+
+def load_view_configs(config: Dict[str, Any]) -> Dict[str, ViewConfiguration]:
+    """
+    Build validated ViewConfiguration models for all configured views
+    
+    When NOTIONCAL_CONFIG_CACHE=1, the models are pickled under
+    ~/.cache/notioncalfeed keyed by a hash of the view settings, so warm
+    restarts with an unchanged configuration skip model validation.
+    
+    Args:
+        config: Configuration dictionary from load_config
+        
+    Returns:
+        Mapping of view name to ViewConfiguration
+    """
+    views_config = config["calendar_views"]
+    if os.getenv("NOTIONCAL_CONFIG_CACHE") != "1":
+        return _build_view_configs(views_config)
+    
+    # Include the model's fields (names, types, defaults) and the cache
+    # version so a code change never loads stale pickles; model_json_schema
+    # would force the deferred model build this cache exists to skip
+    model_fields = repr([
+        (name, field.annotation, field.default)
+        for name, field in ViewConfiguration.model_fields.items()
+    ])
+    key_source = json.dumps(
+        [views_config, model_fields, _VIEW_CACHE_VERSION],
+        sort_keys=True,
+        default=str
+    ).encode()
+    cache_path = os.path.join(
+        _VIEW_CACHE_DIR, f"{hashlib.blake2b(key_source, digest_size=16).hexdigest()}.pkl"
+    )
+    
+    try:
+        with open(cache_path, "rb") as file:
+            view_configs = pickle.load(file)
+        logger.info(f"Loaded view configurations from cache {cache_path}")
+        return view_configs
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable view configuration cache: {e}")
+    
+    view_configs = _build_view_configs(views_config)
+    
+    try:
+        os.makedirs(_VIEW_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as file:
+            pickle.dump(view_configs, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"Could not write view configuration cache: {e}")
+    
+    return view_configs
+
+
+def _build_view_configs(views_config: Dict[str, Any]) -> Dict[str, ViewConfiguration]:
+    """Validate each view's settings into a ViewConfiguration"""
+    return {
+        view_name: ViewConfiguration.model_validate(view_config)
+        for view_name, view_config in views_config.items()
+    }
+
 
 def get_notion_token() -> str:
     """Get Notion API token from environment"""
@@ -0,0 +1,60 @@
+"""
+Calendar event type passed between the Notion client and ICS generator
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Dict, Any
+
+
+@dataclass(slots=True, kw_only=True)
+class CalendarEvent:
+    """
+    Represents a calendar event from Notion
+    
+    A plain slotted dataclass rather than a Pydantic model: events are built
+    from already-parsed Notion data and read many times while rendering, so
+    validation would be wasted work. Use models.CalendarEventSchema to
+    validate or serialize an event at an API boundary.
+    
+    Creation and modification times are kept as the raw ISO 8601 strings
+    from Notion and only parsed when created_time/last_modified are read;
+    the ICS generator formats the raw strings directly.
+    """
+    
+    id: str
+    title: str
+    description: Optional[str] = None
+    start_time: datetime
+    end_time: Optional[datetime] = None
+    all_day: bool = False
+    location: Optional[str] = None
+    url: Optional[str] = None
+    created_time_raw: Optional[str] = None
+    last_modified_raw: Optional[str] = None
+    
+    # Additional Notion-specific properties; the raw page properties are not
+    # kept by the Notion client, as events outlive the query (feed and query
+    # caches) and rendering never reads them
+    notion_page_id: str
+    notion_properties: Optional[Dict[str, Any]] = None
+    
+    @property
+    def created_time(self) -> Optional[datetime]:
+        """When the event was created, parsed from created_time_raw"""
+        return _parse_timestamp(self.created_time_raw)
+    
+    @property
+    def last_modified(self) -> Optional[datetime]:
+        """When the event was last modified, parsed from last_modified_raw"""
+        return _parse_timestamp(self.last_modified_raw)
+
+
+def _parse_timestamp(raw: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO 8601 timestamp, returning None if absent or invalid"""
+    if not raw:
+        return None
+    try:
+        return datetime.fromisoformat(raw)
+    except ValueError:
+        return None
@@ -1,17 +1,286 @@
 """
-ICS calendar generator using the ics.py library
+ICS calendar generator writing RFC 5545 output directly
 """
 
-from datetime import datetime
-from typing import List, Dict, Any
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone, tzinfo
+from functools import lru_cache
+from typing import Callable, Iterator, List, Dict, Any, Optional, Tuple, Union
 import logging
-from ics import Calendar, Event
-import pytz
+from zoneinfo import ZoneInfo
 
-from .models import CalendarEvent, ViewConfiguration
+from .events import CalendarEvent
+from .models import ViewConfiguration
 
 logger = logging.getLogger(__name__)
 
+# Characters that must be backslash-escaped in ICS TEXT values; bare
+# carriage returns are dropped in the same pass
+_ICS_ESCAPE_TABLE = str.maketrans(
+    {"\\": "\\\\", ";": "\\;", ",": "\\,", "\n": "\\n", "\r": None}
+)
+
+# Descriptions longer than this are truncated (some calendar clients have limits)
+_MAX_DESCRIPTION_LENGTH = 2000
+
+# Maximum content line length in octets before folding (RFC 5545 section 3.1)
+_MAX_LINE_OCTETS = 75
+
+# Events rendered per chunk when streaming a calendar
+_EVENTS_PER_CHUNK = 100
+
+# Timezone names recur across views and requests; resolve each only once
+_get_timezone = lru_cache(maxsize=64)(ZoneInfo)
+
+
+def _ics_escape(text: str) -> str:
+    """Escape a TEXT property value for ICS output"""
+    return text.translate(_ICS_ESCAPE_TABLE)
+
+
+def _format_utc(dt: datetime) -> str:
+    """Format a timezone-aware datetime as an ICS UTC timestamp"""
+    return dt.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _format_timestamp(raw: Optional[str]) -> Optional[str]:
+    """
+    Format a raw ISO 8601 timestamp as an ICS UTC timestamp
+    
+    Notion's own timestamps (YYYY-MM-DDTHH:MM:SS.fffZ) are already UTC, so
+    they are sliced into shape without parsing; other offsets are converted.
+    
+    Args:
+        raw: ISO 8601 timestamp, or None
+        
+    Returns:
+        Timestamp as YYYYMMDDTHHMMSSZ, or None if absent or unparseable
+    """
+    if not raw:
+        return None
+    if raw[-1] == "Z" and len(raw) in (20, 24) and raw[10] == "T":
+        return f"{raw[0:4]}{raw[5:7]}{raw[8:10]}T{raw[11:13]}{raw[14:16]}{raw[17:19]}Z"
+    try:
+        dt = datetime.fromisoformat(raw)
+    except ValueError:
+        return None
+    # Naive values carry no zone; treat them as UTC
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return _format_utc(dt)
+
+
+@lru_cache(maxsize=4096)
+def _notion_link(page_id: str) -> str:
+    """Build the Notion page URL for a page ID (IDs recur on every poll)"""
+    return "https://www.notion.so/" + page_id.replace("-", "")
+
+
+def _skip(event_data: CalendarEvent) -> bool:
+    """Whether an event lacks the fields required to render it"""
+    return event_data.start_time is None or event_data.title is None
+
+
+def _fold_line(line: str) -> str:
+    """
+    Fold a content line so no physical line exceeds 75 octets
+    
+    Args:
+        line: Unfolded content line
+        
+    Returns:
+        Content line with CRLF + space continuations where needed
+    """
+    if len(line) <= _MAX_LINE_OCTETS and line.isascii():
+        return line
+    
+    encoded = line.encode("utf-8")
+    parts = []
+    limit = _MAX_LINE_OCTETS
+    while len(encoded) > limit:
+        cut = limit
+        # Never split inside a multi-byte UTF-8 sequence
+        while encoded[cut] & 0xC0 == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut])
+        encoded = encoded[cut:]
+        # Continuation lines start with a space, leaving one octet less
+        limit = _MAX_LINE_OCTETS - 1
+    parts.append(encoded)
+    return b"\r\n ".join(parts).decode("utf-8")
+
+
+def _event_time_lines(event_data: CalendarEvent, tz: tzinfo) -> List[str]:
+    """Build the DTSTART/DTEND (or DURATION) lines for an event"""
+    
+    if event_data.all_day:
+        # All-day event - use date only, spanning start through end day
+        start_date = event_data.start_time.date()
+        end_date = event_data.end_time.date() if event_data.end_time else start_date
+        
+        lines = [f"DTSTART;VALUE=DATE:{start_date:%Y%m%d}"]
+        # DTEND is exclusive; single-day events need none
+        if end_date > start_date:
+            lines.append(f"DTEND;VALUE=DATE:{end_date + timedelta(days=1):%Y%m%d}")
+        return lines
+    
+    # Timed event - written in UTC so no VTIMEZONE component is needed
+    start_time = event_data.start_time
+    if start_time.tzinfo is None:
+        start_time = start_time.replace(tzinfo=tz)
+    lines = [f"DTSTART:{_format_utc(start_time)}"]
+    
+    if event_data.end_time:
+        end_time = event_data.end_time
+        if end_time.tzinfo is None:
+            end_time = end_time.replace(tzinfo=tz)
+        lines.append(f"DTEND:{_format_utc(end_time)}")
+    else:
+        # Default to 1 hour duration
+        lines.append("DURATION:PT1H")
+    
+    return lines
+
+
+# Signature of the per-view VEVENT writer: render(buf, event, dtstamp)
+RenderFunc = Callable[[List[str], CalendarEvent, str], None]
+
+
+def _compile_render(view_config: ViewConfiguration, tz: tzinfo) -> RenderFunc:
+    """
+    Generate a VEVENT writer specialized for one view
+    
+    The title prefix is inlined and the description, location and URL
+    branches are only emitted when the view maps those properties, so the
+    per-event loop carries no checks for settings that cannot change.
+    
+    Args:
+        view_config: Validated view configuration
+        tz: View timezone used for naive datetimes
+        
+    Returns:
+        Function appending the folded VEVENT lines for an event to a buffer
+    """
+    summary = "SUMMARY:" + _ics_escape(view_config.title_prefix or "")
+    
+    # DTSTAMP is required by the ICS spec and set to the generation time
+    src = [
+        "def render(buf, ev, dtstamp):",
+        "    lines = [",
+        "        'BEGIN:VEVENT',",
+        "        'UID:' + ev.id + '@notion-ics-server',",
+        "        'DTSTAMP:' + dtstamp,",
+        f"        {summary!r} + _esc(ev.title),",
+        "    ]",
+        "    lines.extend(_time_lines(ev, tz))",
+    ]
+    
+    # Descriptions longer than the limit are truncated
+    if view_config.description_property:
+        src += [
+            "    description = ev.description",
+            "    if description and len(description) > _max_description:",
+            "        description = description[:_max_description] + '...'",
+        ]
+    else:
+        src.append("    description = None")
+    src.append("    url = ev.url" if view_config.url_property else "    url = None")
+    
+    # Ensure Notion page link is present in description (and URL if absent)
+    src += [
+        "    if ev.notion_page_id:",
+        "        link = _link(ev.notion_page_id)",
+        "        if description:",
+        "            description = description + '\\n\\nNotion: ' + link",
+        "        else:",
+        "            description = 'Notion: ' + link",
+        "        if not url:",
+        "            url = link",
+        "    if description:",
+        "        lines.append('DESCRIPTION:' + _esc(description))",
+    ]
+    if view_config.location_property:
+        src += [
+            "    if ev.location:",
+            "        lines.append('LOCATION:' + _esc(ev.location))",
+        ]
+    src += [
+        "    if url:",
+        "        lines.append('URL:' + url)",
+        "    created = _timestamp(ev.created_time_raw)",
+        "    if created:",
+        "        lines.append('CREATED:' + created)",
+        "    last_modified = _timestamp(ev.last_modified_raw)",
+        "    if last_modified:",
+        "        lines.append('LAST-MODIFIED:' + last_modified)",
+        "    lines.append('END:VEVENT')",
+        "    buf.extend([_fold(line) for line in lines])",
+    ]
+    
+    namespace = {
+        "tz": tz,
+        "_esc": _ics_escape,
+        "_fold": _fold_line,
+        "_link": _notion_link,
+        "_timestamp": _format_timestamp,
+        "_time_lines": _event_time_lines,
+        "_max_description": _MAX_DESCRIPTION_LENGTH,
+    }
+    exec(compile("\n".join(src), f"<render {view_config.database_id}>", "exec"), namespace)
+    return namespace["render"]
+
+
+@dataclass(slots=True, frozen=True)
+class CompiledView:
+    """View settings pre-resolved once for the per-event ICS loop"""
+    
+    database_id: str
+    render: RenderFunc
+
+
+def compile_view(view_config: ViewConfiguration) -> CompiledView:
+    """
+    Resolve a ViewConfiguration into a CompiledView
+    
+    Args:
+        view_config: Validated view configuration
+        
+    Returns:
+        CompiledView holding the view's generated VEVENT writer
+    """
+    return CompiledView(
+        database_id=view_config.database_id,
+        render=_compile_render(view_config, _get_timezone(view_config.timezone)),
+    )
+
+
+# Views compiled on behalf of callers passing a plain ViewConfiguration,
+# keyed by every setting the generated writer depends on
+_COMPILED_VIEWS: Dict[tuple, CompiledView] = {}
+_MAX_COMPILED_VIEWS = 64
+
+
+def _as_compiled(view: Union[ViewConfiguration, CompiledView]) -> CompiledView:
+    """Accept either view representation, compiling each distinct view only once"""
+    if isinstance(view, CompiledView):
+        return view
+    
+    key = (
+        view.database_id,
+        view.timezone,
+        view.title_prefix,
+        view.description_property,
+        view.location_property,
+        view.url_property,
+    )
+    compiled = _COMPILED_VIEWS.get(key)
+    if compiled is None:
+        if len(_COMPILED_VIEWS) >= _MAX_COMPILED_VIEWS:
+            # Drop the oldest entry (dicts keep insertion order)
+            del _COMPILED_VIEWS[next(iter(_COMPILED_VIEWS))]
+        compiled = _COMPILED_VIEWS[key] = compile_view(view)
+    return compiled
+
 
 class ICSGenerator:
     """Generator for ICS calendar files from CalendarEvent objects"""
@@ -24,12 +293,22 @@ class ICSGenerator:
             prodid: Product identifier for the ICS calendar
         """
         self.prodid = prodid
+        
+        # Calendar properties never change between requests
+        self._header_bytes = ("\r\n".join([
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            f"PRODID:{prodid}",
+            "CALSCALE:GREGORIAN",
+            "METHOD:PUBLISH",
+        ]) + "\r\n").encode("utf-8")
+        self._footer_bytes = b"END:VCALENDAR\r\n"
     
     def generate_calendar(
         self, 
         events: List[CalendarEvent], 
         calendar_name: str,
-        view_config: ViewConfiguration
+        view_config: Union[ViewConfiguration, CompiledView]
     ) -> str:
         """
         Generate ICS calendar string from events
@@ -37,194 +316,149 @@ class ICSGenerator:
         Args:
             events: List of CalendarEvent objects
             calendar_name: Name for the calendar
-            view_config: View configuration for additional settings
+            view_config: View configuration (or its compiled form)
             
         Returns:
             ICS calendar content as string
         """
-        try:
-            # Create new ICS calendar
-            calendar = Calendar()
-            
-            # Set calendar properties
-            calendar.prodid = self.prodid
-            calendar.version = "2.0"
-            calendar.scale = "GREGORIAN"
-            calendar.method = "PUBLISH"
-            
-            # Add events to calendar
-            for event_data in events:
-                try:
-                    ics_event = self._create_ics_event(event_data, view_config)
-                    if ics_event:
-                        calendar.events.add(ics_event)
-                except Exception as e:
-                    logger.warning(f"Failed to create ICS event for {event_data.id}: {e}")
-                    continue
-            
-            logger.info(f"Generated ICS calendar with {len(calendar.events)} events")
-            
-            # Return serialized calendar
-            return str(calendar)
+        return self.generate_calendar_bytes(events, calendar_name, view_config).decode("utf-8")
+    
+    def generate_calendar_bytes(
+        self, 
+        events: List[CalendarEvent], 
+        calendar_name: str,
+        view_config: Union[ViewConfiguration, CompiledView]
+    ) -> bytes:
+        """
+        Generate UTF-8 encoded ICS calendar content from events
+        
+        Args:
+            events: List of CalendarEvent objects
+            calendar_name: Name for the calendar
+            view_config: View configuration (or its compiled form)
             
-        except Exception as e:
-            logger.error(f"Error generating ICS calendar: {e}")
-            raise
+        Returns:
+            ICS calendar content as UTF-8 bytes
+        """
+        return self.generate_combined_calendar([(events, view_config)], calendar_name)
     
-    def _create_ics_event(
+    def generate_combined_calendar(
         self, 
-        event_data: CalendarEvent, 
-        view_config: ViewConfiguration
-    ) -> Event:
+        feeds: List[Tuple[List[CalendarEvent], Union[ViewConfiguration, CompiledView]]], 
+        calendar_name: str
+    ) -> bytes:
         """
-        Create an ICS Event from a CalendarEvent
+        Generate a single ICS calendar from the events of several views
         
         Args:
-            event_data: CalendarEvent object
-            view_config: View configuration
+            feeds: (events, view configuration or compiled view) pairs, one per view
+            calendar_name: Name for the calendar
             
         Returns:
-            ICS Event object
+            ICS calendar content as UTF-8 bytes
         """
         try:
-            # Create new ICS event
-            event = Event()
-            
-            # Set basic properties
-            event.uid = f"{event_data.id}@notion-ics-server"
-            # ics.py uses `name` for the event summary/title
-            if view_config.title_prefix:
-                event.name = f"{view_config.title_prefix}{event_data.title}"
-            else:
-                event.name = event_data.title
-            
-            # Set description
-            if event_data.description:
-                event.description = self._clean_description(event_data.description)
-            
-            # Set location
-            if event_data.location:
-                event.location = event_data.location
-            
-            # Set URL
-            if event_data.url:
-                event.url = event_data.url
-
-            # Ensure Notion page link is present in description (and URL if absent)
-            if event_data.notion_page_id:
-                notion_link = f"https://www.notion.so/{event_data.notion_page_id.replace('-', '')}"
-                link_line = f"Notion: {notion_link}"
-                if getattr(event, "description", None):
-                    event.description = f"{event.description}\n\n{link_line}"
-                else:
-                    event.description = link_line
-                if not getattr(event, "url", None):
-                    event.url = notion_link
-            
-            # Set timestamps
-            if event_data.created_time:
-                event.created = event_data.created_time
-            
-            if event_data.last_modified:
-                event.last_modified = event_data.last_modified
-            
-            # Always set dtstamp to current time (required by ICS spec)
-            event.dtstamp = datetime.now(pytz.UTC)
-            
-            # Set start and end times
-            self._set_event_times(event, event_data, view_config)
-            
-            return event
+            return b"".join(self.iter_calendar(feeds, calendar_name))
             
         except Exception as e:
-            logger.error(f"Error creating ICS event: {e}")
+            logger.error(f"Error generating ICS calendar: {e}")
             raise
     
-    def _set_event_times(
+    def iter_calendar(
         self, 
-        event: Event, 
-        event_data: CalendarEvent, 
-        view_config: ViewConfiguration
-    ) -> None:
-        """Set start and end times for the ICS event"""
+        feeds: List[Tuple[List[CalendarEvent], Union[ViewConfiguration, CompiledView]]], 
+        calendar_name: str
+    ) -> Iterator[bytes]:
+        """
+        Generate an ICS calendar incrementally, a batch of events at a time
         
-        try:
-            # Configure timezone
-            timezone = pytz.timezone(view_config.timezone)
+        Lets responses be streamed without holding the whole feed in memory.
+        A page matched by several views (e.g. one database with different
+        filters) would repeat its UID, which RFC 5545 forbids within one
+        calendar, so only the first feed's copy of an event is written.
+        
+        Args:
+            feeds: (events, view configuration or compiled view) pairs, one per view
+            calendar_name: Name for the calendar
             
-            if event_data.all_day:
-                # All-day event - use date only
-                start_date = event_data.start_time.date()
-                event.begin = start_date
-                
-                if event_data.end_time:
-                    end_date = event_data.end_time.date()
-                    event.end = end_date
-                else:
-                    # Default to single day event
-                    event.end = start_date
-                
-                # Mark as all-day
-                event.make_all_day()
-                
-            else:
-                # Timed event
-                start_time = event_data.start_time
-                
-                # Ensure timezone is set
-                if start_time.tzinfo is None:
-                    start_time = timezone.localize(start_time)
-                
-                event.begin = start_time
-                
-                if event_data.end_time:
-                    end_time = event_data.end_time
-                    if end_time.tzinfo is None:
-                        end_time = timezone.localize(end_time)
-                    event.end = end_time
-                else:
-                    # Default to 1 hour duration
-                    event.duration = {"hours": 1}
-                    
-        except Exception as e:
-            logger.error(f"Error setting event times: {e}")
-            # Set fallback times
-            event.begin = event_data.start_time
-            if event_data.end_time:
-                event.end = event_data.end_time
+        Yields:
+            CRLF-terminated, UTF-8 encoded chunks of ICS content
+        """
+        yield self._header_bytes
+        
+        # DTSTAMP is the same for every event, so format it only once
+        dtstamp = _format_utc(datetime.now(timezone.utc))
+        
+        # Event IDs already written; a single view never repeats a page
+        seen = set() if len(feeds) > 1 else None
+        
+        # Add each view's events to the calendar
+        event_count = 0
+        for events, view_config in feeds:
+            view = _as_compiled(view_config)
+            for start in range(0, len(events), _EVENTS_PER_CHUNK):
+                buf = []
+                event_count += self._events_block(
+                    buf, events[start:start + _EVENTS_PER_CHUNK], view, dtstamp, seen
+                )
+                if buf:
+                    # One encode per chunk; the bytes go out without another copy
+                    yield ("\r\n".join(buf) + "\r\n").encode("utf-8")
+        
+        yield self._footer_bytes
+        
+        logger.info(f"Generated ICS calendar with {event_count} events")
     
-    def _clean_description(self, description: str) -> str:
+    def _events_block(
+        self, 
+        buf: List[str], 
+        events: List[CalendarEvent], 
+        view: CompiledView,
+        dtstamp: str,
+        seen: Optional[set] = None
+    ) -> int:
         """
-        Clean and format description text for ICS
+        Append the VEVENT lines for one view's events to the output buffer
         
         Args:
-            description: Raw description text
+            buf: Output buffer of content lines
+            events: List of CalendarEvent objects
+            view: Compiled view settings for these events
+            dtstamp: Formatted generation time used as DTSTAMP
+            seen: IDs of events already written to this calendar, updated
+                in place; events among them are skipped (None disables)
             
         Returns:
-            Cleaned description text
+            Number of events written
         """
-        if not description:
-            return ""
+        render = view.render
         
-        # Remove any problematic characters and normalize line endings
-        cleaned = description.replace("\n", "\n").replace("\r", "")
+        debug = logger.isEnabledFor(logging.DEBUG)
         
-        # Truncate if too long (some calendar clients have limits)
-        max_length = 2000
-        if len(cleaned) > max_length:
-            cleaned = cleaned[:max_length] + "..."
+        event_count = 0
+        for event_data in events:
+            if _skip(event_data):
+                if debug:
+                    logger.debug(f"Skipping event {event_data.id}: missing start time or title")
+                continue
+            if seen is not None:
+                if event_data.id in seen:
+                    continue
+                seen.add(event_data.id)
+            render(buf, event_data, dtstamp)
+            event_count += 1
         
-        return cleaned
+        return event_count
     
     def generate_calendar_with_metadata(
         self, 
         events: List[CalendarEvent], 
         calendar_name: str,
-        view_config: ViewConfiguration,
+        view_config: Union[ViewConfiguration, CompiledView],
         additional_metadata: Dict[str, Any] = None
     ) -> str:
         """
-        Generate ICS calendar with additional metadata in description
+        Generate ICS calendar with additional metadata properties
         
         Args:
             events: List of CalendarEvent objects
@@ -238,24 +472,26 @@ class ICSGenerator:
         # Generate basic calendar
         calendar_content = self.generate_calendar(events, calendar_name, view_config)
         
-        # Add metadata comment at the beginning
-        metadata_lines = [
-            f"# Calendar: {calendar_name}",
-            f"# Generated: {datetime.now().isoformat()}",
-            f"# Events: {len(events)}",
-            f"# Source: Notion Database {view_config.database_id}",
+        # Metadata goes in as X- properties; "#" comments are not valid ICS
+        metadata = [
+            ("Calendar", calendar_name),
+            ("Generated", datetime.now().isoformat()),
+            ("Events", len(events)),
+            ("Source", f"Notion Database {view_config.database_id}"),
         ]
         
         if additional_metadata:
-            for key, value in additional_metadata.items():
-                metadata_lines.append(f"# {key}: {value}")
+            metadata.extend(additional_metadata.items())
         
-        metadata_comment = "\n".join(metadata_lines) + "\n"
+        metadata_block = "".join(
+            _fold_line(f"X-METADATA:{_ics_escape(f'{key}: {value}')}") + "\r\n"
+            for key, value in metadata
+        )
         
-        # Insert metadata after the BEGIN:VCALENDAR line
-        lines = calendar_content.split("\n")
-        if lines and lines[0].startswith("BEGIN:VCALENDAR"):
-            lines.insert(1, metadata_comment)
-            calendar_content = "\n".join(lines)
+        # Insert metadata right after the BEGIN:VCALENDAR line
+        header_end = calendar_content.find("\r\n") + 2
+        calendar_content = (
+            calendar_content[:header_end] + metadata_block + calendar_content[header_end:]
+        )
         
         return calendar_content
@@ -5,15 +5,26 @@ A FastAPI application that serves dynamic ICS calendar feeds
 based on data from Notion calendar database views.
 """
 
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import Response
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import Response, StreamingResponse
+import asyncio
+import hashlib
+import httpx
 import logging
-from typing import Dict, Any
+import time
+from collections import defaultdict
+from typing import Awaitable, Callable, DefaultDict, Dict, Any, Iterator, Tuple
 from contextlib import asynccontextmanager
 
-from .config import load_config
-from .notion_client import NotionCalendarClient
-from .ics_generator import ICSGenerator
+from .config import load_config, load_view_configs
+from .notion_client import (
+    NOTION_HTTP_EVENT_HOOKS,
+    NotionCalendarClient,
+    close_shared_notion,
+    get_events_for_views,
+)
+from .ics_generator import CompiledView, ICSGenerator, compile_view
 from .models import ViewConfiguration
 
 # Set up logging
@@ -23,26 +34,41 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown lifecycle handler replacing deprecated on_event."""
-    global config, notion_clients, view_configs
+    global config, notion_clients, view_configs, compiled_views
+
+    # One pooled HTTP/2 client shared by every view, so TLS sessions and
+    # connections to the Notion API are reused across feeds
+    app.state.http = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        event_hooks=NOTION_HTTP_EVENT_HOOKS
+    )
     try:
         # Load configuration
         config = load_config()
         logger.info("Configuration loaded successfully")
 
         # Initialize Notion clients for each configured view
-        for view_name, view_config_dict in config["calendar_views"].items():
-            vc = ViewConfiguration(**view_config_dict)
+        for view_name, vc in load_view_configs(config).items():
             view_configs[view_name] = vc
+            compiled_views[view_name] = compile_view(vc)
             notion_clients[view_name] = NotionCalendarClient(
-                view_config=vc
+                view_config=vc,
+                http=app.state.http
             )
             logger.info(f"Initialized Notion client for view: {view_name}")
     except Exception as e:
         logger.error(f"Failed to initialize application: {e}")
+        await close_shared_notion()
+        await app.state.http.aclose()
         raise
 
-    # Yield control to the application (no special shutdown needed)
-    yield
+    # Yield control to the application, closing pooled connections on shutdown
+    try:
+        yield
+    finally:
+        await close_shared_notion()
+        await app.state.http.aclose()
 
 # Initialize FastAPI app using lifespan
 app = FastAPI(
@@ -52,14 +78,82 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# ICS is highly repetitive text and typically compresses 5-10x; small
+# JSON responses stay below the threshold and are sent as-is
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Global variables for configuration and clients
 config: Dict[str, Any] = {}
 notion_clients: Dict[str, NotionCalendarClient] = {}
 view_configs: Dict[str, ViewConfiguration] = {}
+compiled_views: Dict[str, CompiledView] = {}
 ics_generator = ICSGenerator()
 
+# Serialized feeds per view: (generated at, ICS body, ETag)
+_feed_cache: Dict[str, Tuple[float, bytes, str]] = {}
+# One lock per view so concurrent cache misses trigger a single Notion fetch
+_feed_locks: DefaultDict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+# Feeds are generated directly as UTF-8 bytes
+ICS_MEDIA_TYPE = "text/calendar; charset=utf-8"
+
+# Name of the combined feed; reserved, so it never collides with a view name
+ALL_VIEWS_FEED = "all"
+
 
- 
+def _feed_response(body: bytes, etag: str, ttl: int, request: Request) -> Response:
+    """Build the ICS response, answering conditional requests with 304"""
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={ttl}"}
+    # If-None-Match uses weak comparison, so ignore any W/ prefix
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag.removeprefix("W/") in (
+        tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+    ):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type=ICS_MEDIA_TYPE, headers=headers)
+
+
+async def _cached_feed(
+    feed_name: str,
+    ttl: int,
+    request: Request,
+    build: Callable[[], Awaitable[Iterator[bytes]]]
+) -> Response:
+    """
+    Serve a feed from the cache, rebuilding it at most once when stale
+    
+    With caching disabled the feed is streamed as it is generated instead;
+    no ETag is sent since the full body is never held in memory.
+    
+    Args:
+        feed_name: Cache key of the feed
+        ttl: Seconds a generated feed stays fresh (0 disables caching)
+        request: Incoming request (used for If-None-Match handling)
+        build: Coroutine function fetching events and returning ICS chunks
+        
+    Returns:
+        ICS response (or 304 Not Modified)
+    """
+    if ttl <= 0:
+        return StreamingResponse(await build(), media_type=ICS_MEDIA_TYPE)
+    
+    cached = _feed_cache.get(feed_name)
+    if cached and time.monotonic() - cached[0] < ttl:
+        return _feed_response(cached[1], cached[2], ttl, request)
+    
+    async with _feed_locks[feed_name]:
+        # Another request may have refreshed the feed while we waited
+        cached = _feed_cache.get(feed_name)
+        if cached and time.monotonic() - cached[0] < ttl:
+            return _feed_response(cached[1], cached[2], ttl, request)
+        
+        body = b"".join(await build())
+        # Hashed before compression and marked weak, so it stays valid for
+        # every content encoding the middleware may apply
+        etag = f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        _feed_cache[feed_name] = (time.monotonic(), body, etag)
+        
+        return _feed_response(body, etag, ttl, request)
 
 
 @app.get("/")
@@ -70,6 +164,7 @@ async def root():
         "available_feeds": list(config.get("calendar_views", {}).keys()),
         "endpoints": {
             "calendar_feed": "/calendar/{view_name}.ics",
+            "all_calendars_feed": f"/calendar/{ALL_VIEWS_FEED}.ics",
             "health": "/health"
         }
     }
@@ -81,13 +176,61 @@ async def health_check():
     return {"status": "healthy", "views_configured": len(notion_clients)}
 
 
+# Registered before the per-view route so "all" is not taken as a view name
+@app.get(f"/calendar/{ALL_VIEWS_FEED}.ics")
+async def get_all_calendars_feed(request: Request):
+    """
+    Get a single ICS calendar feed merging the events of every view
+    
+    Views are queried concurrently, so the feed takes about as long as the
+    slowest view rather than the sum of all of them.
+    
+    Args:
+        request: Incoming request (used for If-None-Match handling)
+        
+    Returns:
+        ICS calendar data as plain text
+    """
+    view_names = sorted(notion_clients)
+    ttl = min((view_configs[name].cache_ttl for name in view_names), default=0)
+    
+    async def build() -> Iterator[bytes]:
+        # Fetch every view concurrently from Notion
+        results = await get_events_for_views([notion_clients[name] for name in view_names])
+        
+        logger.info(
+            f"Generating combined ICS feed for {len(view_names)} views "
+            f"with {sum(len(events) for events in results)} events"
+        )
+        
+        # Generate one ICS calendar with all views' events
+        return ics_generator.iter_calendar(
+            feeds=[(events, compiled_views[name]) for name, events in zip(view_names, results)],
+            calendar_name=ALL_VIEWS_FEED
+        )
+    
+    try:
+        return await _cached_feed(ALL_VIEWS_FEED, ttl, request, build)
+        
+    except Exception as e:
+        logger.error(f"Error generating combined calendar feed: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to generate calendar feed: {str(e)}"
+        )
+
+
 @app.get("/calendar/{view_name}.ics")
-async def get_calendar_feed(view_name: str):
+async def get_calendar_feed(view_name: str, request: Request):
     """
     Get ICS calendar feed for a specific Notion database view
     
+    Generated feeds are cached per view for ``cache_ttl`` seconds, so
+    frequent subscriber polls do not hit Notion on every request.
+    
     Args:
         view_name: Name of the configured calendar view
+        request: Incoming request (used for If-None-Match handling)
         
     Returns:
         ICS calendar data as plain text
@@ -98,21 +241,23 @@ async def get_calendar_feed(view_name: str):
             detail=f"Calendar view '{view_name}' not found"
         )
     
-    try:
+    view_config = view_configs[view_name]
+    
+    async def build() -> Iterator[bytes]:
         # Get calendar events from Notion
         notion_client = notion_clients[view_name]
         events = await notion_client.get_calendar_events()
         
+        logger.info(f"Generating ICS feed for '{view_name}' with {len(events)} events")
+        
         # Generate ICS calendar
-        view_config = view_configs[view_name]
-        ics_content = ics_generator.generate_calendar(
-            events=events,
-            calendar_name=view_name,
-            view_config=view_config
+        return ics_generator.iter_calendar(
+            feeds=[(events, compiled_views[view_name])],
+            calendar_name=view_name
         )
-        
-        logger.info(f"Generated ICS feed for '{view_name}' with {len(events)} events")
-        return Response(content=ics_content, media_type="text/calendar")
+    
+    try:
+        return await _cached_feed(view_name, view_config.cache_ttl, request, build)
         
     except Exception as e:
         logger.error(f"Error generating calendar feed for '{view_name}': {e}")
@@ -2,7 +2,7 @@
 Pydantic models for Notion ICS Calendar Feed Server
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
@@ -31,8 +31,13 @@ class NotionPropertyType(str, Enum):
     LAST_EDITED_BY = "last_edited_by"
 
 
-class CalendarEvent(BaseModel):
-    """Represents a calendar event from Notion"""
+class CalendarEventSchema(BaseModel):
+    """
+    Pydantic schema of a calendar event for validation and serialization
+    
+    The pipeline itself uses the lighter events.CalendarEvent dataclass;
+    convert with CalendarEventSchema.model_validate(event, from_attributes=True).
+    """
     
     id: str = Field(description="Unique identifier for the event")
     title: str = Field(description="Event title/summary")
@@ -47,17 +52,21 @@ class CalendarEvent(BaseModel):
     
     # Additional Notion-specific properties
     notion_page_id: str = Field(description="Notion page ID")
-    notion_properties: Dict[str, Any] = Field(default_factory=dict, description="Raw Notion properties")
+    notion_properties: Optional[Dict[str, Any]] = Field(default=None, description="Raw Notion properties, if retained")
     
-    class Config:
-        json_encoders = {
+    model_config = ConfigDict(
+        defer_build=True,
+        json_encoders={
             datetime: lambda v: v.isoformat()
         }
+    )
 
 
 class ViewConfiguration(BaseModel):
     """Configuration for a Notion calendar view"""
     
+    model_config = ConfigDict(defer_build=True)
+    
     database_id: str = Field(description="Notion database ID")
     date_property: str = Field(description="Name of the date property to use")
     title_property: Optional[str] = Field(default="Name", description="Property to use for event title")
@@ -83,11 +92,17 @@ class ViewConfiguration(BaseModel):
     calendar_description: Optional[str] = Field(default=None, description="Calendar description")
     timezone: str = Field(default="UTC", description="Timezone for the calendar")
     title_prefix: Optional[str] = Field(default=None, description="String to prepend to every event title")
+    
+    # Feed caching
+    cache_ttl: int = Field(default=300, description="Seconds to cache the generated ICS feed; 0 disables caching")
+    query_cache_ttl: int = Field(default=60, description="Seconds to reuse a query's converted events; 0 disables caching")
 
 
 class NotionConfiguration(BaseModel):
     """Notion API configuration"""
     
+    model_config = ConfigDict(defer_build=True)
+    
     api_token: str = Field(description="Notion API integration token")
     api_version: str = Field(default="2022-06-28", description="Notion API version")
     timeout: int = Field(default=30, description="Request timeout in seconds")
@@ -96,6 +111,8 @@ class NotionConfiguration(BaseModel):
 class ServerConfiguration(BaseModel):
     """Server configuration"""
     
+    model_config = ConfigDict(defer_build=True)
+    
     host: str = Field(default="0.0.0.0", description="Server host")
     port: int = Field(default=8000, description="Server port")
     reload: bool = Field(default=False, description="Enable auto-reload in development")
@@ -104,6 +121,8 @@ class ServerConfiguration(BaseModel):
 class ApplicationConfiguration(BaseModel):
     """Complete application configuration"""
     
+    model_config = ConfigDict(defer_build=True)
+    
     notion: NotionConfiguration
     calendar_views: Dict[str, ViewConfiguration]
     server: Optional[ServerConfiguration] = Field(default_factory=ServerConfiguration)
@@ -121,6 +140,8 @@ class ApplicationConfiguration(BaseModel):
 class ErrorResponse(BaseModel):
     """Standard error response model"""
     
+    model_config = ConfigDict(defer_build=True)
+    
     error: str = Field(description="Error type")
     message: str = Field(description="Error message")
     details: Optional[Dict[str, Any]] = Field(default=None, description="Additional error details")
@@ -129,6 +150,8 @@ class ErrorResponse(BaseModel):
 class HealthResponse(BaseModel):
     """Health check response model"""
     
+    model_config = ConfigDict(defer_build=True)
+    
     status: str = Field(description="Health status")
     views_configured: int = Field(description="Number of configured calendar views")
     uptime: Optional[float] = Field(default=None, description="Server uptime in seconds")
@@ -137,6 +160,8 @@ class HealthResponse(BaseModel):
 class CalendarFeedInfo(BaseModel):
     """Information about available calendar feeds"""
     
+    model_config = ConfigDict(defer_build=True)
+    
     message: str = Field(description="Welcome message")
     available_feeds: List[str] = Field(description="List of available calendar feed names")
     endpoints: Dict[str, str] = Field(description="Available API endpoints")
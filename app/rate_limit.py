@@ -0,0 +1,53 @@
+"""
+Async rate limiting for Notion API requests
+"""
+
+import asyncio
+import time
+
+
+class AsyncTokenBucket:
+    """
+    Token bucket limiting how often an operation may start
+    
+    Tokens refill continuously at `rate` per second up to `capacity`; each
+    `async with bucket:` block takes one token, waiting until one is free.
+    """
+    
+    def __init__(self, rate: float, capacity: int):
+        """
+        Initialize token bucket
+        
+        Args:
+            rate: Tokens added per second (sustained operations per second)
+            capacity: Maximum tokens held (operations allowed in a burst)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self) -> None:
+        """Take one token, sleeping until the bucket has refilled enough"""
+        # Waiters queue on the lock, so tokens are handed out in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+    
+    async def __aenter__(self) -> "AsyncTokenBucket":
+        await self.acquire()
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        return None
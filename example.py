@@ -14,14 +14,15 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
-from app.models import ViewConfiguration
-from app.notion_client import NotionCalendarClient
-from app.ics_generator import ICSGenerator
-
 
 async def example_usage():
     """Example of how to use the components directly"""
     
+    # Imported here since the Notion client pulls in notion_client and httpx
+    from app.models import ViewConfiguration
+    from app.notion_client import NotionCalendarClient
+    from app.ics_generator import ICSGenerator
+    
     # Example configuration for a calendar view
     view_config = ViewConfiguration(
         database_id="your-database-id-here",
@@ -3,11 +3,13 @@
 Main entry point for Notion ICS Calendar Feed Server
 """
 
-import uvicorn
-from app.config import get_server_config
-
 def main():
     """Run the server with configuration from environment/config"""
+    # Imported here so importing this module (tooling, introspection) stays
+    # cheap; only actually starting the server needs uvicorn and the app
+    import uvicorn
+    from app.config import get_server_config
+    
     try:
         server_config = get_server_config()
         
@@ -0,0 +1,147 @@
+"""
+Tests for the fast YAML path of the configuration loader
+"""
+
+from pathlib import Path
+
+import pytest
+import yaml
+
+import app.config as config_module
+from app.config import _fast_parse, load_view_configs
+from app.models import ViewConfiguration
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _typed(value):
+    """Pair every value with its type, since True == 1 and 0 == False"""
+    if isinstance(value, dict):
+        return {key: _typed(item) for key, item in value.items()}
+    return (type(value).__name__, value)
+
+
+def assert_matches_yaml(text: str) -> None:
+    """The fast parser either gives up or agrees exactly with PyYAML"""
+    parsed = _fast_parse(text)
+    if parsed is not None:
+        assert _typed(parsed) == _typed(yaml.safe_load(text))
+
+
+@pytest.mark.parametrize("name", ["config.yaml", "config.example.yaml"])
+def test_shipped_configs_parse_like_pyyaml(name):
+    text = (REPO_ROOT / name).read_text()
+    parsed = _fast_parse(text)
+    
+    # The shipped configs must not need the PyYAML fallback
+    assert parsed is not None
+    assert _typed(parsed) == _typed(yaml.safe_load(text))
+
+
+@pytest.mark.parametrize("value", [
+    "yes", "Yes", "YES", "no", "No", "NO",
+    "true", "True", "TRUE", "false", "False", "FALSE",
+    "on", "On", "ON", "off", "Off", "OFF",
+    "y", "n", "yEs",
+])
+def test_yaml_11_booleans(value):
+    assert_matches_yaml(f"flag: {value}\n")
+
+
+@pytest.mark.parametrize("value", ["~", "null", "Null", "NULL", "nULL", "None"])
+def test_nulls(value):
+    assert_matches_yaml(f"value: {value}\n")
+
+
+@pytest.mark.parametrize("line", [
+    'value: "a # b"',
+    "value: 'a # b'",
+    'value: "a # b" # comment',
+    "value: 'a # b'  # comment",
+    'value: "a"#b',
+    "value: a#b",
+    "value: a # comment",
+    "value: a  #comment",
+    'value: ""',
+    "value: ''",
+    'value: "it\'s"',
+    "value: 'it''s'",
+    'value: "tab\\tescape"',
+])
+def test_quoted_values_and_comments(line):
+    assert_matches_yaml(line + "\n")
+
+
+@pytest.mark.parametrize("value", [
+    "0", "7", "10", "007", "0755", "08", "1_000", "-5", "+5", "1.5", "1e3", "0x1F", "12:30",
+])
+def test_integers(value):
+    assert_matches_yaml(f"number: {value}\n")
+
+
+@pytest.mark.parametrize("text", [
+    # Empty value opening a nested block
+    "outer:\n  inner: 1\n",
+    "outer:  # comment\n  inner:\n    deepest: x\n  sibling: y\n",
+    # Empty value followed by a sibling, and at EOF
+    "first:\nsecond: 2\n",
+    "only:\n",
+    "outer:\n  inner:\n",
+    "outer:\n  inner:\nnext: 1\n",
+    # Comments and blank lines between a key and its block
+    "outer:\n\n  # note\n  inner: 1\n",
+])
+def test_empty_values(text):
+    parsed = _fast_parse(text)
+    assert parsed is not None
+    assert _typed(parsed) == _typed(yaml.safe_load(text))
+
+
+@pytest.mark.parametrize("text", [
+    "key: 1\nkey: 2\n",
+    "outer:\n  key: 1\n  key: 2\n",
+    "outer:\n  key: 1\nouter:\n  other: 2\n",
+])
+def test_duplicate_keys_fall_back(text):
+    # PyYAML keeps the last value; the fast path leaves that to PyYAML
+    assert _fast_parse(text) is None
+
+
+@pytest.mark.parametrize("text", [
+    "items:\n  - a\n  - b\n",
+    "flow: {a: 1}\n",
+    "block: |\n  text\n",
+    "anchor: &a 1\n",
+    "tagged: !!str 1\n",
+    "date: 2024-01-01\n",
+    "bad:\n\tindent: 1\n",
+    "a:\n    b: 1\n  c: 2\n",
+])
+def test_unsupported_syntax_falls_back(text):
+    assert_matches_yaml(text)
+
+
+VIEWS = {"calendar_views": {"work": {"database_id": "db", "date_property": "Date"}}}
+
+
+@pytest.fixture
+def view_cache(tmp_path, monkeypatch):
+    """Enable the view model cache in a temporary directory"""
+    monkeypatch.setenv("NOTIONCAL_CONFIG_CACHE", "1")
+    monkeypatch.setattr(config_module, "_VIEW_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_view_cache_round_trip(view_cache):
+    first = load_view_configs(VIEWS)
+    assert len(list(view_cache.iterdir())) == 1
+    assert load_view_configs(VIEWS) == first
+
+
+def test_view_cache_key_follows_model_defaults(view_cache, monkeypatch):
+    load_view_configs(VIEWS)
+    monkeypatch.setattr(ViewConfiguration.model_fields["cache_ttl"], "default", 301)
+    
+    # A changed default must not load pickles carrying the old value
+    load_view_configs(VIEWS)
+    assert len(list(view_cache.iterdir())) == 2
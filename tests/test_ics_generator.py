@@ -0,0 +1,194 @@
+"""
+Tests for the RFC 5545 serialization helpers of the ICS generator
+"""
+
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from app.events import CalendarEvent
+from app.ics_generator import (
+    ICSGenerator,
+    _event_time_lines,
+    _fold_line,
+    _ics_escape,
+)
+from app.models import ViewConfiguration
+
+NEW_YORK = ZoneInfo("America/New_York")
+
+
+def make_event(**fields) -> CalendarEvent:
+    """Build a CalendarEvent with placeholder identity fields"""
+    fields.setdefault("id", "abc123")
+    fields.setdefault("title", "Event")
+    fields.setdefault("notion_page_id", "abc-123")
+    return CalendarEvent(**fields)
+
+
+def unfold(text: str) -> str:
+    """Undo line folding (RFC 5545 section 3.1)"""
+    return text.replace("\r\n ", "")
+
+
+# --- Line folding ---
+
+def test_short_line_is_not_folded():
+    line = "SUMMARY:" + "x" * 67
+    assert len(line) == 75
+    assert _fold_line(line) == line
+
+
+def test_long_ascii_line_folds_at_75_octets():
+    line = "DESCRIPTION:" + "x" * 200
+    physical = _fold_line(line).split("\r\n")
+    
+    assert len(physical[0]) == 75
+    assert all(part.startswith(" ") for part in physical[1:])
+    assert all(len(part) <= 75 for part in physical)
+    assert unfold(_fold_line(line)) == line
+
+
+@pytest.mark.parametrize("char", ["é", "€", "日", "😀"])
+@pytest.mark.parametrize("prefix_length", range(4))
+def test_folding_never_splits_multibyte_characters(char, prefix_length):
+    # Shift the text so folds land on every offset within a character
+    line = "SUMMARY:" + "x" * prefix_length + char * 80
+    folded = _fold_line(line)
+    
+    for part in folded.split("\r\n"):
+        encoded = part.encode("utf-8")
+        assert len(encoded) <= 75
+        # A split character would leave undecodable bytes at a line edge
+        assert encoded.decode("utf-8") == part
+    assert unfold(folded) == line
+
+
+def test_fold_counts_octets_not_characters():
+    # 40 two-octet characters are 80 octets but only 48 characters
+    line = "SUMMARY:" + "é" * 40
+    assert len(line) < 75
+    assert "\r\n " in _fold_line(line)
+
+
+# --- TEXT escaping ---
+
+@pytest.mark.parametrize("text, expected", [
+    ("plain", "plain"),
+    ("back\\slash", "back\\\\slash"),
+    ("semi;colon", "semi\\;colon"),
+    ("com,ma", "com\\,ma"),
+    ("new\nline", "new\\nline"),
+    ("crlf\r\nline", "crlf\\nline"),
+    ("bare\rreturn", "barereturn"),
+    ("a\\;b,c\n", "a\\\\\\;b\\,c\\n"),
+    ("colon: stays", "colon: stays"),
+])
+def test_ics_escape(text, expected):
+    assert _ics_escape(text) == expected
+
+
+# --- All-day events ---
+
+def test_single_day_event_has_no_dtend():
+    event = make_event(start_time=datetime(2024, 5, 1, tzinfo=NEW_YORK), all_day=True)
+    assert _event_time_lines(event, NEW_YORK) == ["DTSTART;VALUE=DATE:20240501"]
+
+
+def test_all_day_end_on_start_day_has_no_dtend():
+    start = datetime(2024, 5, 1, tzinfo=NEW_YORK)
+    event = make_event(start_time=start, end_time=start, all_day=True)
+    assert _event_time_lines(event, NEW_YORK) == ["DTSTART;VALUE=DATE:20240501"]
+
+
+def test_multi_day_event_dtend_is_day_after_last_day():
+    # Notion's end date is the last day of the event; DTEND is exclusive
+    event = make_event(
+        start_time=datetime(2024, 5, 30, tzinfo=NEW_YORK),
+        end_time=datetime(2024, 6, 1, tzinfo=NEW_YORK),
+        all_day=True,
+    )
+    assert _event_time_lines(event, NEW_YORK) == [
+        "DTSTART;VALUE=DATE:20240530",
+        "DTEND;VALUE=DATE:20240602",
+    ]
+
+
+# --- Timed events ---
+
+def test_naive_datetimes_use_view_timezone():
+    event = make_event(
+        start_time=datetime(2024, 5, 1, 9, 0),
+        end_time=datetime(2024, 5, 1, 10, 30),
+    )
+    # New York is UTC-4 in May
+    assert _event_time_lines(event, NEW_YORK) == [
+        "DTSTART:20240501T130000Z",
+        "DTEND:20240501T143000Z",
+    ]
+
+
+def test_naive_datetime_follows_dst():
+    event = make_event(start_time=datetime(2024, 1, 15, 9, 0))
+    # UTC-5 in January
+    assert _event_time_lines(event, NEW_YORK)[0] == "DTSTART:20240115T140000Z"
+
+
+def test_offset_datetimes_convert_to_utc():
+    event = make_event(
+        start_time=datetime.fromisoformat("2024-05-01T09:00:00.000+05:30"),
+        end_time=datetime.fromisoformat("2024-05-01T23:30:00.000-02:00"),
+    )
+    # The offsets win over the view timezone
+    assert _event_time_lines(event, NEW_YORK) == [
+        "DTSTART:20240501T033000Z",
+        "DTEND:20240502T013000Z",
+    ]
+
+
+def test_utc_datetime_is_unchanged():
+    event = make_event(start_time=datetime(2024, 5, 1, 9, 0, tzinfo=timezone.utc))
+    assert _event_time_lines(event, NEW_YORK)[0] == "DTSTART:20240501T090000Z"
+
+
+def test_timed_event_without_end_lasts_one_hour():
+    event = make_event(start_time=datetime(2024, 5, 1, 9, 0, tzinfo=timezone.utc))
+    assert _event_time_lines(event, NEW_YORK) == [
+        "DTSTART:20240501T090000Z",
+        "DURATION:PT1H",
+    ]
+
+
+# --- Whole calendar ---
+
+def test_generated_calendar_is_escaped_and_folded():
+    view = ViewConfiguration(
+        database_id="db",
+        date_property="Date",
+        description_property="Notes",
+        title_prefix="[P] ",
+        timezone="America/New_York",
+    )
+    event = make_event(
+        title="Café, bar; más",
+        description="Línea uno\nlínea dos " + "ü" * 60,
+        start_time=datetime(2024, 5, 1, 9, 0),
+        end_time=datetime(2024, 5, 1, 10, 0),
+        created_time_raw="2024-01-02T03:04:05.000Z",
+    )
+    ics = ICSGenerator().generate_calendar([event], "test", view)
+    
+    assert ics.startswith("BEGIN:VCALENDAR\r\n")
+    assert ics.endswith("END:VCALENDAR\r\n")
+    assert all(len(line.encode("utf-8")) <= 75 for line in ics.split("\r\n"))
+    
+    lines = unfold(ics).split("\r\n")
+    assert "SUMMARY:[P] Café\\, bar\\; más" in lines
+    assert "DTSTART:20240501T130000Z" in lines
+    assert "DTEND:20240501T140000Z" in lines
+    assert "CREATED:20240102T030405Z" in lines
+    assert (
+        "DESCRIPTION:Línea uno\\nlínea dos " + "ü" * 60
+        + "\\n\\nNotion: https://www.notion.so/abc123"
+    ) in lines
@@ -0,0 +1,172 @@
+"""
+Tests for feed caching, conditional requests and compression
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.main as main_module
+from app.events import CalendarEvent
+from app.notion_client import NotionCalendarClient
+
+CONFIG = """
+notion:
+  api_token: ${NOTION_TOKEN}
+calendar_views:
+  cached:
+    database_id: "db-cached"
+    date_property: "Date"
+    cache_ttl: 300
+  live:
+    database_id: "db-live"
+    date_property: "Date"
+    cache_ttl: 0
+"""
+
+
+class Clock:
+    """Replacement for the time module the feed cache reads"""
+    
+    def __init__(self):
+        self.now = 1000.0
+    
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def fetches(monkeypatch):
+    """Stub Notion: every view returns 20 events; counts fetches per database"""
+    counts = {}
+    
+    async def get_calendar_events(self):
+        database_id = self.view_config.database_id
+        counts[database_id] = counts.get(database_id, 0) + 1
+        start = datetime(2024, 5, 1, 9, tzinfo=timezone.utc)
+        return [
+            CalendarEvent(
+                id=f"{database_id}{i}",
+                title=f"Event {i} (fetch {counts[database_id]})",
+                start_time=start + timedelta(days=i),
+                notion_page_id=f"{database_id}-{i}",
+            )
+            for i in range(20)
+        ]
+    
+    monkeypatch.setattr(NotionCalendarClient, "get_calendar_events", get_calendar_events)
+    return counts
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(main_module, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch, fetches, clock):
+    (tmp_path / "config.yaml").write_text(CONFIG)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("NOTION_TOKEN", "secret_test")
+    monkeypatch.delenv("NOTIONCAL_CONFIG_CACHE", raising=False)
+    main_module._feed_cache.clear()
+    
+    with TestClient(main_module.app) as test_client:
+        yield test_client
+    
+    main_module._feed_cache.clear()
+
+
+def test_cached_feed_has_weak_etag(client, fetches):
+    response = client.get("/calendar/cached.ics")
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"] == main_module.ICS_MEDIA_TYPE
+    assert response.headers["etag"].startswith('W/"')
+    assert response.headers["cache-control"] == "public, max-age=300"
+    assert response.text.startswith("BEGIN:VCALENDAR\r\n")
+    assert fetches == {"db-cached": 1}
+
+
+@pytest.mark.parametrize("if_none_match", [
+    "{etag}",
+    "{strong}",
+    '"other", {etag}',
+    '"other",{strong}',
+])
+def test_matching_if_none_match_gets_304(client, fetches, if_none_match):
+    etag = client.get("/calendar/cached.ics").headers["etag"]
+    header = if_none_match.format(etag=etag, strong=etag.removeprefix("W/"))
+    
+    response = client.get("/calendar/cached.ics", headers={"If-None-Match": header})
+    
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert fetches == {"db-cached": 1}
+
+
+def test_other_etag_gets_the_feed(client):
+    response = client.get("/calendar/cached.ics", headers={"If-None-Match": 'W/"other"'})
+    
+    assert response.status_code == 200
+    assert response.text.startswith("BEGIN:VCALENDAR")
+
+
+def test_feed_is_rebuilt_after_ttl(client, fetches, clock):
+    first = client.get("/calendar/cached.ics")
+    
+    clock.now += 299
+    assert client.get("/calendar/cached.ics").headers["etag"] == first.headers["etag"]
+    assert fetches == {"db-cached": 1}
+    
+    clock.now += 1
+    refreshed = client.get("/calendar/cached.ics", headers={"If-None-Match": first.headers["etag"]})
+    
+    # The stub's titles change on every fetch, so the old ETag no longer matches
+    assert fetches == {"db-cached": 2}
+    assert refreshed.status_code == 200
+    assert refreshed.headers["etag"] != first.headers["etag"]
+
+
+def test_uncached_feed_is_streamed_without_etag(client, fetches):
+    first = client.get("/calendar/live.ics")
+    second = client.get("/calendar/live.ics", headers={"If-None-Match": "*"})
+    
+    for response in (first, second):
+        assert response.status_code == 200
+        assert "etag" not in response.headers
+        assert response.headers["content-type"] == main_module.ICS_MEDIA_TYPE
+        assert response.text.endswith("END:VCALENDAR\r\n")
+    assert fetches == {"db-live": 2}
+
+
+def test_gzip_keeps_the_etag_and_304(client, fetches):
+    plain = client.get("/calendar/cached.ics", headers={"Accept-Encoding": "identity"})
+    compressed = client.get("/calendar/cached.ics", headers={"Accept-Encoding": "gzip"})
+    
+    assert "content-encoding" not in plain.headers
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert int(compressed.headers["content-length"]) < len(plain.content)
+    assert compressed.content == plain.content
+    assert compressed.headers["etag"] == plain.headers["etag"]
+    
+    not_modified = client.get(
+        "/calendar/cached.ics",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": compressed.headers["etag"]},
+    )
+    assert not_modified.status_code == 304
+    assert fetches == {"db-cached": 1}
+
+
+def test_combined_feed_uses_the_shortest_ttl(client, fetches):
+    # The live view disables caching, so the combined feed is streamed too
+    response = client.get("/calendar/all.ics")
+    
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+    assert response.text.count("BEGIN:VEVENT") == 40
+    assert fetches == {"db-cached": 1, "db-live": 1}
@@ -0,0 +1,269 @@
+"""
+Tests for fetching a view's pages from Notion
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+import app.notion_client as notion_client_module
+from app.models import ViewConfiguration
+from app.notion_client import NotionCalendarClient
+from app.rate_limit import AsyncTokenBucket
+
+
+class FakeDatabase:
+    """
+    Stand-in for the Notion databases endpoint
+    
+    Honours page_size, start_cursor, date sorts and the on_or_after /
+    on_or_before conditions of the date filter, comparing page starts.
+    """
+    
+    def __init__(self, starts):
+        self.pages = [
+            {
+                "id": f"page-{i}",
+                "created_time": "2024-01-01T00:00:00.000Z",
+                "last_edited_time": "2024-01-01T00:00:00.000Z",
+                "properties": {
+                    "Date": {"type": "date", "date": {"start": start, "end": None}},
+                    "Name": {"type": "title", "title": [{"plain_text": f"Event {i}"}]},
+                },
+            }
+            for i, start in enumerate(starts)
+        ]
+        self.calls = []
+    
+    async def query(self, **params):
+        self.calls.append(params)
+        await asyncio.sleep(0)
+        rows = [page for page in self.pages if self._matches(page, params.get("filter"))]
+        if params.get("sorts"):
+            rows.sort(key=self._start)
+        
+        offset = int(params.get("start_cursor") or 0)
+        chunk = rows[offset:offset + params["page_size"]]
+        next_offset = offset + len(chunk)
+        has_more = next_offset < len(rows)
+        return {
+            "results": chunk,
+            "has_more": has_more,
+            "next_cursor": str(next_offset) if has_more else None,
+        }
+    
+    async def retrieve(self, **params):
+        return {"properties": {"Date": {"type": "date"}, "Name": {"type": "title"}}}
+    
+    def _start(self, page):
+        start = datetime.fromisoformat(page["properties"]["Date"]["date"]["start"])
+        # Notion compares dates without an offset as UTC
+        return start if start.tzinfo else start.replace(tzinfo=timezone.utc)
+    
+    def _matches(self, page, query_filter):
+        conditions = self._date_conditions(query_filter or {})
+        start = self._start(page)
+        for condition in conditions:
+            if "on_or_after" in condition and start < datetime.fromisoformat(condition["on_or_after"]):
+                return False
+            if "on_or_before" in condition and start > datetime.fromisoformat(condition["on_or_before"]):
+                return False
+        return True
+    
+    def _date_conditions(self, query_filter):
+        if "and" in query_filter:
+            return [c for part in query_filter["and"] for c in self._date_conditions(part)]
+        return [query_filter["date"]] if "date" in query_filter else []
+
+
+@pytest.fixture(autouse=True)
+def unlimited_rate(monkeypatch):
+    """Keep the shared 3 requests/second limit from slowing the tests"""
+    monkeypatch.setattr(
+        notion_client_module, "_NOTION_RATE_LIMIT", AsyncTokenBucket(rate=1e6, capacity=1000)
+    )
+    monkeypatch.setenv("NOTION_TOKEN", "secret_test")
+
+
+def make_client(database, days_back=30, days_forward=365, **settings):
+    """Build a view client whose Notion API is the fake database"""
+    view_config = ViewConfiguration(
+        database_id="db",
+        date_property="Date",
+        title_property="Name",
+        query_days_back=days_back,
+        query_days_forward=days_forward,
+        query_cache_ttl=0,
+        timezone="America/New_York",
+        **settings,
+    )
+    client = NotionCalendarClient(view_config)
+    client.notion = SimpleNamespace(databases=database)
+    return client
+
+
+def spread_starts(count, fmt=None):
+    """Start times spread evenly over the default query range"""
+    now = datetime.now(timezone.utc)
+    first = now - timedelta(days=29)
+    span = timedelta(days=390)
+    starts = [first + span * (i + 0.5) / count for i in range(count)]
+    if fmt:
+        return [start.strftime(fmt) for start in starts]
+    return [start.isoformat() for start in starts]
+
+
+def fetch(client):
+    return asyncio.run(client.get_calendar_events())
+
+
+def page_ids(events):
+    return [event.notion_page_id for event in events]
+
+
+def assert_complete(events, database):
+    """Every page became exactly one event"""
+    ids = page_ids(events)
+    assert len(ids) == len(set(ids))
+    assert set(ids) == {page["id"] for page in database.pages}
+
+
+def test_small_view_is_answered_by_the_probe():
+    database = FakeDatabase(spread_starts(50))
+    events = fetch(make_client(database))
+    
+    assert_complete(events, database)
+    assert len(database.calls) == 1
+
+
+def test_one_more_page_follows_the_cursor():
+    # The probe covers about two thirds of the range: one page is left
+    database = FakeDatabase(spread_starts(150))
+    events = fetch(make_client(database))
+    
+    assert_complete(events, database)
+    assert len(database.calls) == 2
+    assert database.calls[1]["start_cursor"] == "100"
+    assert database.calls[1]["filter"] == database.calls[0]["filter"]
+
+
+def test_large_view_splits_the_remaining_range():
+    database = FakeDatabase(spread_starts(1000))
+    events = fetch(make_client(database))
+    
+    assert_complete(events, database)
+    probe, *windows = database.calls
+    # The probe's pages are kept rather than fetched again
+    assert all(call["filter"] != probe["filter"] for call in windows)
+    first_pages = [call for call in windows if "start_cursor" not in call]
+    assert len(first_pages) == notion_client_module._MAX_QUERY_WINDOWS
+    # Windows start where the probe's pages ended
+    probe_end = database.pages[99]["properties"]["Date"]["date"]["start"]
+    assert min(
+        datetime.fromisoformat(call["filter"]["and"][0]["date"]["on_or_after"])
+        for call in first_pages
+    ) == datetime.fromisoformat(probe_end)
+    # Close to the 10 requests following the cursor would take
+    assert len(database.calls) <= 1 + 2 * notion_client_module._MAX_QUERY_WINDOWS
+
+
+def test_window_count_follows_the_remaining_pages():
+    # 350 pages: about two and a half pages remain after the probe, so
+    # the rest of the range is split into three windows
+    database = FakeDatabase(spread_starts(350))
+    events = fetch(make_client(database))
+    
+    assert_complete(events, database)
+    assert len([call for call in database.calls[1:] if "start_cursor" not in call]) == 3
+
+
+def test_pages_matched_by_several_windows_appear_once():
+    # Every page shares one instant, so the probe and each window match
+    # all of them
+    start = (datetime.now(timezone.utc) + timedelta(days=1)).isoformat()
+    database = FakeDatabase([start] * 250)
+    events = fetch(make_client(database))
+    
+    assert_complete(events, database)
+
+
+def test_unbounded_range_follows_the_cursor():
+    database = FakeDatabase(spread_starts(250))
+    events = fetch(make_client(database, days_back=None))
+    
+    assert_complete(events, database)
+    assert [call.get("start_cursor") for call in database.calls] == [None, "100", "200"]
+
+
+def test_naive_timed_starts_on_a_split_range():
+    # Notion times without an offset must not break comparing the probe's
+    # last date with the (aware) range bounds
+    database = FakeDatabase(spread_starts(250, "%Y-%m-%dT%H:%M:%S.000"))
+    events = fetch(make_client(database))
+    
+    assert sorted(event.notion_page_id for event in events) == sorted(
+        page["id"] for page in database.pages
+    )
+
+
+class FailingDatabase(FakeDatabase):
+    """Fake database whose nth query fails, answering the others slowly"""
+    
+    def __init__(self, starts, fail_on):
+        super().__init__(starts)
+        self.fail_on = fail_on
+        self.started = 0
+    
+    async def query(self, **params):
+        self.started += 1
+        if self.started == self.fail_on:
+            self.calls.append(params)
+            raise RuntimeError("Notion is down")
+        await asyncio.sleep(0.01)
+        return await super().query(**params)
+
+
+def test_failed_window_stops_the_other_windows():
+    database = FailingDatabase(spread_starts(1000), fail_on=3)
+    client = make_client(database)
+    
+    async def run():
+        with pytest.raises(RuntimeError):
+            await client.get_calendar_events()
+        started_at_failure = database.started
+        # Give orphaned windows time to request their next pages
+        await asyncio.sleep(0.1)
+        return started_at_failure
+    
+    started_at_failure = asyncio.run(run())
+    assert database.started == started_at_failure
+
+
+class RetypedDatabase(FakeDatabase):
+    """Fake database whose "Where" property became a select after the schema was read"""
+    
+    def __init__(self, starts):
+        super().__init__(starts)
+        for page in self.pages:
+            page["properties"]["Where"] = {"type": "select", "select": {"name": "Room 1"}}
+        self.retrieved = 0
+    
+    async def retrieve(self, **params):
+        self.retrieved += 1
+        schema = await super().retrieve(**params)
+        schema["properties"]["Where"] = {"type": "rich_text"}
+        return schema
+
+
+def test_changed_property_type_falls_back_to_the_value_type():
+    database = RetypedDatabase(spread_starts(5))
+    client = make_client(database, location_property="Where")
+    
+    events = fetch(client)
+    assert [event.location for event in events] == ["Room 1"] * 5
+    
+    # The stale schema is read again on the next fetch
+    fetch(client)
+    assert database.retrieved == 2